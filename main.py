@@ -1,18 +1,34 @@
 from __future__ import annotations
 from enum import Enum
-from typing import Callable, Literal, Optional, Tuple
+from typing import Callable, Optional, Tuple
 import pygame
 
 # import pygame._sdl2 as pygame_sdl2
-import math
 import random
 from pathlib import Path
 import time
 
+# Set to True to print diagnostics (block spawns, resize maths, etc.).
+# The `if __debug__ and DEBUG_EVENTS:` guards compile away under python -O
+DEBUG_EVENTS = False
+
 
 class Asset:
-    CAR_IMAGE = pygame.image.load(Path("assets", "racecar.png"))
-    CAR_IMAGE_ALT = pygame.image.load(Path("assets", "racecar-alt.png"))
+    CAR_IMAGE: Optional[pygame.Surface] = None
+    CAR_IMAGE_ALT: Optional[pygame.Surface] = None
+
+    @classmethod
+    def load(cls):
+        """Loads the image assets, converting them to the display's pixel format
+        so that blitting them doesn't have to convert pixels on the fly.
+
+        Must be called after the display surface has been initialised."""
+        cls.CAR_IMAGE = pygame.image.load(
+            Path("assets", "racecar.png")
+        ).convert_alpha()
+        cls.CAR_IMAGE_ALT = pygame.image.load(
+            Path("assets", "racecar-alt.png")
+        ).convert_alpha()
 
 
 class Color:
@@ -48,6 +64,11 @@ class Corner(Enum):
 
 
 class PointSpecifier:
+    # These point objects are small, numerous and read every frame, so use
+    # __slots__ to keep them compact and make attribute access a fixed-slot
+    # lookup rather than a dict access
+    __slots__ = ()
+
     def resolve(
         self, game: Game, width: float = 0, height: float = 0
     ) -> Tuple[float, float]:
@@ -70,18 +91,48 @@ class PointSpecifier:
     ):
         raise NotImplementedError()
 
+    def apply_velocity(self, x_pixels: float, y_pixels: float):
+        """Moves the point right and down by the given number of pixels"""
+        self.move_right(x_pixels)
+        self.move_down(y_pixels)
+
 
 class PixelsPoint(PointSpecifier):
+    __slots__ = (
+        "x",
+        "y",
+        "relative_to",
+        "_x_sign",
+        "_y_sign",
+        "_cache_key",
+        "_cache_value",
+    )
+
     def __init__(self, x: float, y: float, relative_to: Corner = Corner.TOP_LEFT):
         self.x = x
         self.y = y
         self.relative_to = relative_to
 
+        # Precomputed direction multipliers: moving right/down means
+        # decreasing x/y when we're relative to a right/bottom corner
+        self._x_sign = -1 if relative_to.value[0] else 1
+        self._y_sign = -1 if relative_to.value[1] else 1
+
+        # Memoized result of the last resolve() call, since the same point
+        # tends to be resolved several times per frame
+        self._cache_key = None
+        self._cache_value = (0.0, 0.0)
+
     def resolve(
         self, game: Game, width: float = 0, height: float = 0
     ) -> Tuple[float, float]:
         outer_width = game.window_box().width
         outer_height = game.window_box().height
+
+        cache_key = (outer_width, outer_height, width, height, self.x, self.y)
+        if cache_key == self._cache_key:
+            return self._cache_value
+
         multiplier_x, multiplier_y = self.relative_to.value
 
         # Coordinates of the window corner that we're working relative to
@@ -101,27 +152,25 @@ class PixelsPoint(PointSpecifier):
         actual_y_coordinate = base_y_coordinate + y_offset
 
         # print(actual_x_coordinate, actual_y_coordinate)
-        return (actual_x_coordinate, actual_y_coordinate)
+        self._cache_key = cache_key
+        self._cache_value = (actual_x_coordinate, actual_y_coordinate)
+        return self._cache_value
 
     def move_right(self, pixels: float):
-        x_corner = self.relative_to.value[0]
-        pixel_movement = -pixels if x_corner else +pixels
-        self.x += pixel_movement
+        self.x += pixels * self._x_sign
 
     def move_left(self, pixels: float):
-        x_corner = self.relative_to.value[0]
-        pixel_movement = +pixels if x_corner else -pixels
-        self.x += pixel_movement
+        self.x -= pixels * self._x_sign
 
     def move_down(self, pixels: float):
-        y_corner = self.relative_to.value[1]
-        pixel_movement = -pixels if y_corner else +pixels
-        self.y += pixel_movement
+        self.y += pixels * self._y_sign
 
     def move_up(self, pixels: float):
-        y_corner = self.relative_to.value[1]
-        pixel_movement = +pixels if y_corner else -pixels
-        self.y += pixel_movement
+        self.y -= pixels * self._y_sign
+
+    def apply_velocity(self, x_pixels: float, y_pixels: float):
+        self.x += x_pixels * self._x_sign
+        self.y += y_pixels * self._y_sign
 
     def move_to(
         self, target_coordinates: Tuple[float, float], width: float, height: float
@@ -152,6 +201,8 @@ class PixelsPoint(PointSpecifier):
 
 
 class PercentagePoint(PointSpecifier):
+    __slots__ = ("x", "y", "relative_to")
+
     def __init__(self, x: float, y: float, relative_to: Corner = Corner.TOP_LEFT):
         self.x = x
         self.y = y
@@ -160,15 +211,33 @@ class PercentagePoint(PointSpecifier):
     def resolve(
         self, game: Game, width: float = 0, height: float = 0
     ) -> Tuple[float, float]:
+        # Same maths as PixelsPoint.resolve (with our percentages scaled up to
+        # pixels), inlined so we don't allocate a throwaway PixelsPoint per call
         outer_box = game.window_box()
-        x_pixels = self.x * outer_box.width
-        y_pixels = self.y * outer_box.height
+        outer_width = outer_box.width
+        outer_height = outer_box.height
+        x_pixels = self.x * outer_width
+        y_pixels = self.y * outer_height
+        multiplier_x, multiplier_y = self.relative_to.value
+
+        # Coordinates of the window corner that we're working relative to
+        base_x_coordinate = multiplier_x * outer_width
+        base_y_coordinate = multiplier_y * outer_height
 
-        pixels_point = PixelsPoint(x_pixels, y_pixels, self.relative_to)
-        return pixels_point.resolve(game, width, height)
+        # Calculate the number of pixels away from the corner that we should be at
+        x_offset = -x_pixels if multiplier_x else +x_pixels
+        y_offset = -y_pixels if multiplier_y else +y_pixels
+
+        # Account for the x/y offsets not always measuring from our top-left
+        x_offset -= width * multiplier_x
+        y_offset -= height * multiplier_y
+
+        return (base_x_coordinate + x_offset, base_y_coordinate + y_offset)
 
 
 class Box:
+    __slots__ = ("x1", "y1", "x2", "y2", "width", "height")
+
     def __init__(self, x1: float, y1: float, x2: float, y2: float):
         self.x1 = x1
         self.y1 = y1
@@ -221,93 +290,240 @@ class Box:
 
         return is_outside_x or is_outside_y
 
+    @staticmethod
+    def overlaps_raw(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2) -> bool:
+        """Checks if two boxes, given as raw coordinates, overlap.
+
+        Equivalent to `not a.is_outside(b)` without allocating any boxes."""
+        return not (ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2)
+
+    @staticmethod
+    def contains_raw(
+        ox1, oy1, ox2, oy2, ix1, iy1, ix2, iy2, allowed_margin=0.0
+    ) -> bool:
+        """Checks if the inner box (i) is inside the outer box (o), with both
+        given as raw coordinates.
+
+        Equivalent to `inner.is_inside(outer, ...)` without allocating boxes."""
+        return (
+            ox1 - ix1 <= allowed_margin
+            and ix2 - ox2 <= allowed_margin
+            and oy1 - iy1 <= allowed_margin
+            and iy2 - oy2 <= allowed_margin
+        )
+
 
 class Game:
     def __init__(self, theme: type[DefaultTheme]):
+        # Initialise all of pygame's subsystems upfront, so nothing gets
+        # lazily (and more slowly) initialised on first use
+        pygame.init()
+
         # Window display config
         self.theme = theme
         self.background_color = self.theme.BACKGROUND
 
-        # Initilise the display surface
-        self.surface = pygame.display.set_mode((300, 300), pygame.RESIZABLE)
+        # Initilise the display surface, asking for vsync where the driver
+        # supports it so the flip itself paces us with minimal jitter
+        self.surface = pygame.display.set_mode((300, 300), pygame.RESIZABLE, vsync=1)
         pygame.display.set_caption("A bit Racey")
+        Asset.load()
+
+        # Cache the window dimensions so that we don't have to query SDL
+        # (and rebuild a Box) every time an object asks about the window
+        self._window_dims_cache = self.surface.get_size()
+        self._window_box_cache = Box(
+            0, 0, self._window_dims_cache[0], self._window_dims_cache[1]
+        )
+        self.rebuild_background()
 
         # Initialise other game components
         self.MAX_FPS = 60
+        # Frame pacing state: SDL_Delay (used by clock.tick) can be ~15ms
+        # coarse on some platforms, so we track our own deadline on the
+        # monotonic clock and only busy-spin for the final stretch
+        self._monotonic = time.monotonic_ns
+        self._frame_interval_ns = 1_000_000_000 // self.MAX_FPS
+        self._next_frame_deadline = self._monotonic() + self._frame_interval_ns
+        self.SPATIAL_HASH_CELL_SIZE = 64
+        self._spatial_hash: dict[
+            Tuple[int, int],
+            list[tuple[GameObject, Tuple[float, float, float, float]]],
+        ] = {}
+        # Blits queued up by the textures this frame, flushed in one
+        # Surface.blits call to avoid a Python->C round-trip per object
+        self._blit_queue: list = []
+
+        # Dirty-rect tracking: the areas drawn last frame, which need to be
+        # restored to the background colour and re-presented this frame
+        self._dirty_rects: list[pygame.Rect] = []
+        self._needs_full_redraw = True
         self.clock = pygame.time.Clock()
         self.has_died = False
         self.objects: list[GameObject] = []
-        self.old_window_dimensions = (self.width(), self.height())
+        self._old_window_w = self.width()
+        self._old_window_h = self.height()
         self.key_action_callbacks = {}
+        # Callbacks indexed by raw key code, so keydown dispatch is a single
+        # dict lookup instead of key -> action -> callback
+        self.key_down_callbacks = {}
         self.key_up_callbacks = {}
 
         # Set up default keybinds
         self.keybinds = {pygame.K_LEFT: "move.left", pygame.K_RIGHT: "move.right"}
 
-        pygame.init()
+        # Map each event type we care about to its handler, so that on_event
+        # is a single dict lookup instead of a chain of comparisons
+        self.event_handlers = {
+            pygame.QUIT: self.on_quit,
+            pygame.VIDEORESIZE: self.on_window_resize,
+            pygame.KEYDOWN: self.on_key_down,
+            pygame.KEYUP: self.on_key_up,
+            pygame.FINGERDOWN: self.on_finger_motion,
+            pygame.FINGERMOTION: self.on_finger_motion,
+            pygame.FINGERUP: self.on_finger_up,
+        }
+
+        # Load each font once upfront, rather than re-parsing the font file
+        # on every death screen or HUD object construction
+        self.title_font = pygame.font.Font("freesansbold.ttf", 115)
+        self.fps_font = pygame.font.Font("freesansbold.ttf", 12)
+        self.score_font = pygame.font.Font("freesansbold.ttf", 14)
+
+        # Rendered title surfaces, keyed by their text, so repeated deaths
+        # don't re-rasterize the same 115px string
+        self._title_cache: dict[str, pygame.Surface] = {}
+
+        # Don't even let SDL queue up event types that we'd just ignore
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(self.event_handlers))
 
     def width(self) -> int:
         """Returns the width of the window, in pixels"""
-        return self.surface.get_width()
+        return self._window_dims_cache[0]
 
     def height(self) -> int:
         """Returns the height of the window, in pixels"""
-        return self.surface.get_height()
+        return self._window_dims_cache[1]
 
     def window_box(self) -> Box:
-        """Calculates the box that represents the size of the window"""
-        x1 = 0
-        y1 = 0
-        x2 = self.width()
-        y2 = self.height()
+        """Returns the box that represents the size of the window"""
+        return self._window_box_cache
+
+    def refresh_window_cache(self):
+        """Re-reads the window size from SDL and rebuilds the cached window box"""
+        self._window_dims_cache = self.surface.get_size()
+        self._window_box_cache = Box(
+            0, 0, self._window_dims_cache[0], self._window_dims_cache[1]
+        )
 
-        return Box(x1, y1, x2, y2)
+    def rebuild_background(self):
+        """Pre-fills a display-format backdrop surface sized to the window.
+
+        Restoring the background is then a same-format blit, which also
+        means a textured backdrop could be dropped in without touching the
+        frame loop."""
+        self._background = pygame.Surface(self._window_dims_cache).convert()
+        # Map the colour tuple to a raw pixel value once, so fill doesn't
+        # have to translate it (re-mapped here since the pixel format can
+        # change when the window is recreated)
+        self._bg_pixel = self._background.map_rgb(self.background_color)
+        self._background.fill(self._bg_pixel)
+
+    def rebuild_spatial_hash(self):
+        """Buckets each solid object into the grid cells that its collision box
+        overlaps, so collision checks only need to look at nearby objects.
+
+        The resolved collision bounds are stored alongside each object, so the
+        narrow phase doesn't have to resolve positions all over again."""
+        self._spatial_hash.clear()
+        cell_size = self.SPATIAL_HASH_CELL_SIZE
+        for object in self.objects:
+            if not object.is_solid:
+                continue
+            bounds = object.collision_tuple()
+            x1, y1, x2, y2 = bounds
+            entry = (object, bounds)
+            for cell_x in range(int(x1 // cell_size), int(x2 // cell_size) + 1):
+                for cell_y in range(int(y1 // cell_size), int(y2 // cell_size) + 1):
+                    self._spatial_hash.setdefault((cell_x, cell_y), []).append(entry)
+
+    def drain_events(self, max_events=32):
+        """Pumps SDL once, then processes up to max_events pending events.
+
+        Any overflow is re-posted so it gets handled next tick instead of
+        blowing this frame's time budget (relevant under event floods, e.g.
+        high-polling-rate mice). SDL-level filtering via set_allowed means
+        the queue normally only holds events we actually handle."""
+        pygame.event.pump()
+        events = pygame.event.get(pump=False)
+        for event in events[:max_events]:
+            self.on_event(event)
+        for event in events[max_events:]:
+            pygame.event.post(event)
 
     def on_event(self, event):
-        # print(event)
-        if event.type == pygame.QUIT:
-            self.exited = True
-        elif event.type == pygame.VIDEORESIZE:
-            event.old_dimensions = self.old_window_dimensions
-            for object in self.objects:
-                if not object.window_resize_handler:
-                    continue
-                object.window_resize_handler.handle_window_resize(event)
-            self.old_window_dimensions = (self.width(), self.height())
-
-        # Keyboard input
-        elif event.type == pygame.KEYDOWN:
-            if event.key in self.keybinds:
-                action = self.keybinds[event.key]
-                self.trigger_key_action(action, event)
-        elif event.type == pygame.KEYUP:
-            if event.key in self.key_up_callbacks:
-                callback = self.key_up_callbacks[event.key]
-                callback()
-
-        # Touch input
-        elif event.type == pygame.FINGERDOWN:
-            target_point = PercentagePoint(event.x, event.y)
-            self.car.movement_targets[event.finger_id] = target_point
-        elif event.type == pygame.FINGERMOTION:
-            target_point = PercentagePoint(event.x, event.y)
-            self.car.movement_targets[event.finger_id] = target_point
-        elif event.type == pygame.FINGERUP:
-            try:
-                self.car.movement_targets.pop(event.finger_id)
-            except KeyError:
-                print(f"Ignoring keypress from #{event.finger_id} on #{event.touch_id}")
-
-    def trigger_key_action(self, action: str, event: pygame.event.Event):
-        if action not in self.key_action_callbacks:
+        handler = self.event_handlers.get(event.type)
+        if handler:
+            handler(event)
+
+    def on_quit(self, event):
+        self.exited = True
+
+    def on_window_resize(self, event):
+        self.refresh_window_cache()
+        self.rebuild_background()
+        self._needs_full_redraw = True
+        # Attach the before/after dimensions once, so every resize handler
+        # can read them instead of re-deriving them per object
+        event.old_dimensions = (self._old_window_w, self._old_window_h)
+        event.new_dimensions = (event.w, event.h)
+        for object in self.objects:
+            if not object.window_resize_handler:
+                continue
+            object.window_resize_handler.handle_window_resize(event)
+        self._old_window_w = self.width()
+        self._old_window_h = self.height()
+
+    # Keyboard input
+    def on_key_down(self, event):
+        action_callback = self.key_down_callbacks.get(event.key)
+        if action_callback is None:
             return
-        action_callback = self.key_action_callbacks[action]
         on_key_up = action_callback(event)
-        self.key_up_callbacks[event.key] = lambda: on_key_up(event)
+        # Store the callback and its argument as a plain tuple, rather than
+        # allocating a closure for every keypress
+        self.key_up_callbacks[event.key] = (on_key_up, event)
+
+    def on_key_up(self, event):
+        # Popping the entry also drops the reference to the keydown event
+        callback = self.key_up_callbacks.pop(event.key, None)
+        if callback:
+            undo_action, key_down_event = callback
+            undo_action(key_down_event)
+
+    # Touch input (FINGERDOWN and FINGERMOTION are handled identically)
+    def on_finger_motion(self, event):
+        target_point = PercentagePoint(event.x, event.y)
+        self.car.movement_targets[event.finger_id] = target_point
+
+    def on_finger_up(self, event):
+        try:
+            self.car.movement_targets.pop(event.finger_id)
+        except KeyError:
+            if __debug__ and DEBUG_EVENTS:
+                print(
+                    f"Ignoring keypress from #{event.finger_id} on #{event.touch_id}"
+                )
 
     def on_key_action(self, action: str):
         def decorator(callback):
             self.key_action_callbacks[action] = callback
+            # Index the callback by every key bound to this action, for the
+            # flat dispatch in on_key_down
+            for key, bound_action in self.keybinds.items():
+                if bound_action == action:
+                    self.key_down_callbacks[key] = callback
 
         return decorator
 
@@ -316,20 +532,47 @@ class Game:
         return surface, surface.get_rect()
 
     def display_title(self, text: str):
-        large_font = pygame.font.Font("freesansbold.ttf", 115)
-        text_surface, text_rect = self.create_text(text, large_font)
+        text_surface = self._title_cache.get(text)
+        if text_surface is None:
+            text_surface = self.create_text(text, self.title_font)[0]
+            self._title_cache[text] = text_surface
+        text_rect = text_surface.get_rect()
 
         window_center_x, window_center_y = self.window_box().center()
-        text_rect.center = math.floor(window_center_x), math.floor(window_center_y)
+        text_rect.center = int(window_center_x), int(window_center_y)
         self.surface.blit(text_surface, text_rect)
         self.update_display()
 
         print("You died!")
-        time.sleep(2)
+        # Keep handling events while the title is shown, so the window stays
+        # responsive and quitting isn't delayed until the next session
+        end_time = pygame.time.get_ticks() + 2000
+        while pygame.time.get_ticks() < end_time and not self.exited:
+            self.drain_events()
+            self.clock.tick(30)
 
     def update_display(self):
         pygame.display.update()
 
+    def wait_for_next_frame(self):
+        """Sleeps until the next frame deadline: a coarse pygame wait for most
+        of the remaining time, then a short busy-spin for accuracy"""
+        deadline = self._next_frame_deadline
+        remaining_ms = (deadline - self._monotonic()) // 1_000_000
+        if remaining_ms > 2:
+            pygame.time.wait(int(remaining_ms) - 2)
+        while self._monotonic() < deadline:
+            pass
+
+        # If we've fallen behind, start the next frame from now rather than
+        # trying to catch up
+        self._next_frame_deadline = (
+            max(deadline, self._monotonic()) + self._frame_interval_ns
+        )
+
+        # Untimed tick keeps the clock's stats fresh for get_fps()
+        self.clock.tick()
+
     def trigger_crash(self):
         self.display_title("You died!")
         self.has_died = True
@@ -343,6 +586,7 @@ class Game:
     def game_session(self):
         self.has_died = False
         self.dodged_blocks = 0
+        self._needs_full_redraw = True
 
         self.car = Car(game=self)
         self.objects.append(self.car)
@@ -358,33 +602,77 @@ class Game:
 
         self.objects.append(ScoreCounter(game=self, spawn_point=PixelsPoint(5, 5)))
 
-        while not self.has_died and not self.exited:
-            for event in pygame.event.get():
-                self.on_event(event)
-
-            # Reset the surface
-            self.surface.fill(self.background_color)
+        # Pre-resolve the bound methods needed for each object's per-frame
+        # update, so the loop below doesn't do attribute lookups per object.
+        # The objects list doesn't change mid-session (blocks are recycled
+        # in place), so building this once per session is enough.
+        object_pass = [
+            (object.run_tick_tasks, object.is_outside_window, object.draw)
+            for object in self.objects
+        ]
+
+        # Hoist frequently-used attributes into locals, turning the repeated
+        # attribute lookups in the loop body into plain LOAD_FASTs
+        surface = self.surface
+        blit_queue = self._blit_queue
+        refresh_window_cache = self.refresh_window_cache
+        rebuild_spatial_hash = self.rebuild_spatial_hash
+        drain_events = self.drain_events
+        update_display = self.update_display
+        wait_for_next_frame = self.wait_for_next_frame
 
-            # Spawn a new block if the old one has passed the bottom screen edge
+        while not self.has_died and not self.exited:
+            refresh_window_cache()
+            rebuild_spatial_hash()
+
+            drain_events()
+
+            # Reset the surface from the pre-filled backdrop - or, if we can
+            # get away with it, just the areas that were drawn over last
+            # frame. (These have to be blits rather than fills, and SDL won't
+            # blit to an explicitly locked surface, so no outer lock here.
+            # Not hoisted into a local because resizes swap the surface out.)
+            background = self._background
+            if self._needs_full_redraw:
+                surface.blit(background, (0, 0))
+            else:
+                for rect in self._dirty_rects:
+                    surface.blit(background, rect, rect)
+
+            # Respawn the block once it has passed the bottom screen edge
             if active_block.coordinates()[1] > self.height():
-                self.objects.remove(active_block)
-                active_block = Block(game=self, spawn_at=-20)
-                self.objects.append(active_block)
+                active_block.recycle(spawn_at=-20)
                 self.dodged_blocks += 1
 
-            # Update the objects
-            for object in self.objects:
-                object.run_tick_tasks()
-                object.draw()
-
-            self.update_display()
-            self.clock.tick(self.MAX_FPS)
+            # Update the objects, skipping the draw for anything that's
+            # entirely offscreen (e.g. a block that hasn't scrolled in yet)
+            for run_tick_tasks, is_outside_window, draw in object_pass:
+                run_tick_tasks()
+                if not is_outside_window():
+                    draw()
+
+            # Flush all of the blits that the textures queued up, in one
+            # call, keeping the affected rects for next frame's cleanup
+            new_rects = surface.blits(blit_queue) if blit_queue else []
+            blit_queue.clear()
+
+            # Only push the changed regions to the display, and skip the
+            # present entirely on frames where nothing changed at all
+            if self._needs_full_redraw:
+                self._needs_full_redraw = False
+                update_display()
+            elif self._dirty_rects or new_rects:
+                pygame.display.update(self._dirty_rects + new_rects)
+            self._dirty_rects = new_rects
+
+            wait_for_next_frame()
 
             # miliseconds_per_frame = self.clock.get_rawtime()
             # print(miliseconds_per_frame)
 
         self.objects.clear()
         self.key_action_callbacks.clear()
+        self.key_down_callbacks.clear()
         self.key_up_callbacks.clear()
 
 
@@ -409,14 +697,14 @@ class PlainColorTexture(Texture):
         self.color = color
         super().__init__(width, height)
 
+        # Pre-fill a surface once, so that drawing is a batched blit rather
+        # than a per-frame rect fill
+        self._cached_surface = pygame.Surface((int(width), int(height))).convert()
+        self._cached_surface.fill(color)
+
     def draw_at(self, top_left):
         x1, y1 = top_left.resolve(self.game, self.width(), self.height())
-
-        pygame.draw.rect(
-            self.game.surface,
-            self.color,
-            [x1, y1, self.width(), self.height()],
-        )
+        self.game._blit_queue.append((self._cached_surface, (x1, y1)))
 
 
 class TextTexture(Texture):
@@ -435,12 +723,23 @@ class TextTexture(Texture):
     def render_text(self, start_x: float, start_y: float):
         """Computes a surface and bounding rect for the text, but doesn't draw it to the screen"""
         text_content, text_color = self.get_content()
-        use_antialiasing = True
-        text_surface = self.font.render(text_content, use_antialiasing, text_color)
+
+        # Only re-rasterize the text when it actually changes, since font
+        # rendering is expensive and the content is often identical for
+        # many frames in a row
+        if (text_content, text_color) == self._last_content:
+            text_surface = self._last_surface
+        else:
+            use_antialiasing = True
+            text_surface = self.font.render(text_content, use_antialiasing, text_color)
+            self._last_content = (text_content, text_color)
+            self._last_surface = text_surface
 
         text_rect = text_surface.get_rect()
-        text_rect.left = math.floor(start_x)
-        text_rect.top = math.floor(start_y)
+        # int() rather than math.floor() since these window-relative
+        # coordinates are never negative, and int() skips a function call
+        text_rect.left = int(start_x)
+        text_rect.top = int(start_y)
 
         return text_surface, text_rect
 
@@ -455,6 +754,8 @@ class TextTexture(Texture):
         self._get_content = get_content
         self.font = font
         self.get_color = get_color or (lambda: self.game.theme.FOREGROUND)
+        self._last_content = None
+        self._last_surface = None
         self.current_rect = self.render_text(0, 0)[1]
         super().__init__(self.width(), self.height())
 
@@ -462,7 +763,7 @@ class TextTexture(Texture):
         start_x, start_y = top_left.resolve(self.game, self.width(), self.height())
         text_surface, text_rect = self.render_text(start_x, start_y)
         self.current_rect = text_rect
-        self.game.surface.blit(text_surface, text_rect)
+        self.game._blit_queue.append((text_surface, text_rect))
 
 
 class ImageTexture(Texture):
@@ -476,15 +777,24 @@ class ImageTexture(Texture):
 
     def draw_at(self, top_left: PointSpecifier):
         start_x, start_y = top_left.resolve(self.game, self.width(), self.height())
-        self.game.surface.blit(self.image, (start_x, start_y))
+        self.game._blit_queue.append((self.image, (start_x, start_y)))
 
 
 class GameObject:
     def height(self) -> float:
-        return self.texture.height()
+        return self.texture.height() if self._dynamic_size else self._h
 
     def width(self) -> float:
-        return self.texture.width()
+        return self.texture.width() if self._dynamic_size else self._w
+
+    def refresh_size_snapshot(self):
+        """Re-caches the texture dimensions, e.g. after swapping the texture.
+
+        Text textures resize as their content changes, so they skip the
+        snapshot and stay on the dynamic path."""
+        self._dynamic_size = isinstance(self.texture, TextTexture)
+        self._w = self.texture.width()
+        self._h = self.texture.height()
 
     def spawn_point(self) -> PointSpecifier:
         raise NotImplementedError()
@@ -505,7 +815,14 @@ class GameObject:
         assert isinstance(self.game, Game)
         self.game: Game = self.game
         self.tick_tasks: list[Callable] = []
+        self._compiled_tick = None
+        self._compiled_tick_count = -1
+        self._collision_cache_resolved = None
+        self._collision_cache_w = None
+        self._collision_cache_h = None
+        self._collision_cache_value = None
         self.texture = texture
+        self.refresh_size_snapshot()
         self.window_resize_handler = window_resize_handler
         self.is_solid = solid
         self.reset()
@@ -514,8 +831,29 @@ class GameObject:
         raise NotImplementedError()
 
     def run_tick_tasks(self):
-        for callback in self.tick_tasks:
-            callback()
+        # (Re)compile whenever a task has been added since the last run
+        if len(self.tick_tasks) != self._compiled_tick_count:
+            self._compile_tick_tasks()
+        self._compiled_tick()
+
+    def _compile_tick_tasks(self):
+        """Builds an unrolled function that calls each tick task back-to-back,
+        avoiding the list iteration and per-callback dispatch on every tick.
+
+        The task callbacks are bound as default arguments, so calling the
+        compiled function doesn't touch this object at all."""
+        tasks = tuple(self.tick_tasks)
+        parameters = ", ".join(
+            "task{0}=tasks[{0}]".format(index) for index in range(len(tasks))
+        )
+        calls = "; ".join("task{0}()".format(index) for index in range(len(tasks)))
+        namespace = {"tasks": tasks}
+        exec(
+            "def run_compiled({0}):\n    {1}".format(parameters, calls or "pass"),
+            namespace,
+        )
+        self._compiled_tick = namespace["run_compiled"]
+        self._compiled_tick_count = len(tasks)
 
     def calculate_center_bounds(self, parent_width: float, parent_height: float) -> Box:
         """Calculates the box of possible positions for the center point of this object"""
@@ -531,11 +869,34 @@ class GameObject:
 
     def collision_box(self) -> Box:
         """Calculates the visual bounding box (i.e. collision box) for this object"""
-        x1, y1 = self.position.resolve(self.game, self.width(), self.height())
-        x2 = x1 + self.width()
-        y2 = y1 + self.height()
-
-        return Box(x1, y1, x2, y2)
+        return Box(*self.collision_tuple())
+
+    def collision_tuple(self) -> Tuple[float, float, float, float]:
+        """Like collision_box(), but returns the raw (x1, y1, x2, y2)
+        coordinates without allocating a Box.
+
+        The result is reused across calls while the object hasn't moved or
+        resized, since several checks ask for it within the same frame."""
+        width = self.width()
+        height = self.height()
+        resolved = self.position.resolve(self.game, width, height)
+
+        # Identity check against the memoized resolve result: on a hit, no
+        # new tuples get allocated at all
+        if (
+            resolved is self._collision_cache_resolved
+            and width == self._collision_cache_w
+            and height == self._collision_cache_h
+        ):
+            return self._collision_cache_value
+
+        x1, y1 = resolved
+        value = (x1, y1, x1 + width, y1 + height)
+        self._collision_cache_resolved = resolved
+        self._collision_cache_w = width
+        self._collision_cache_h = height
+        self._collision_cache_value = value
+        return value
 
     def calculate_position_percentage(self, bounds: Box) -> Tuple[float, float]:
         """Calculates the position of the center of the object, returning coordinates in the form (x, y)
@@ -544,9 +905,12 @@ class GameObject:
         """
         center_x, center_y = self.collision_box().center()
 
-        # Calculate the percentage position of the center relative to the bounding box
-        percentage_x = (center_x - bounds.left) / bounds.width
-        percentage_y = (center_y - bounds.top) / bounds.height
+        # Calculate the percentage position of the center relative to the bounding box.
+        # Multiply by the reciprocals, since multiplication is cheaper than division
+        inverse_width = 1.0 / bounds.width
+        inverse_height = 1.0 / bounds.height
+        percentage_x = (center_x - bounds.left) * inverse_width
+        percentage_y = (center_y - bounds.top) * inverse_height
 
         return percentage_x, percentage_y
 
@@ -566,11 +930,25 @@ class GameObject:
 
     def is_within_window(self, allowed_margin=0.0):
         window = self.game.window_box()
-        return self.collision_box().is_inside(window, allowed_margin)
+        x1, y1, x2, y2 = self.collision_tuple()
+        return Box.contains_raw(
+            window.x1,
+            window.y1,
+            window.x2,
+            window.y2,
+            x1,
+            y1,
+            x2,
+            y2,
+            allowed_margin,
+        )
 
     def is_outside_window(self):
         window = self.game.window_box()
-        return self.collision_box().is_outside(window)
+        x1, y1, x2, y2 = self.collision_tuple()
+        return not Box.overlaps_raw(
+            x1, y1, x2, y2, window.x1, window.y1, window.x2, window.y2
+        )
 
     def coordinates(self):
         return self.position.resolve(self.game, self.width(), self.height())
@@ -602,10 +980,13 @@ class LinearPositionScaling(WindowResizeHandler):
         position_percentage = self.object.calculate_position_percentage(
             old_center_point_bounds
         )
-        print("Was at", position_percentage)
+        if __debug__ and DEBUG_EVENTS:
+            print("Was at", position_percentage)
 
         # Update object's position to be the in the same place relative to the window size
-        new_center_point_bounds = self.object.calculate_center_bounds(event.w, event.h)
+        new_center_point_bounds = self.object.calculate_center_bounds(
+            *event.new_dimensions
+        )
         new_center = self.object.map_relative_position_to_box(
             position_percentage, new_center_point_bounds
         )
@@ -616,12 +997,10 @@ class LinearPositionScaling(WindowResizeHandler):
 
 
 class Velocity:
-    def on_tick(self):
-        x_movement = self.x
-        y_movement = self.y
+    __slots__ = ("x", "y", "base_speed", "object")
 
-        self.object.position.move_right(x_movement)
-        self.object.position.move_down(y_movement)
+    def on_tick(self):
+        self.object.position.apply_velocity(self.x, self.y)
 
     def __init__(self, game_object: GameObject, base_speed: float):
         # Magnitudes of velocity, measured in pixels/tick
@@ -642,14 +1021,14 @@ class Velocity:
 
 
 class Car(GameObject):
-    def calculate_starting_x(self):
-        window_width = self.game.width()
+    # Bit flags for tracking which movement keys are currently held
+    DIRECTION_LEFT = 1
+    DIRECTION_RIGHT = 2
 
-        # Calculate where the centre of the car should go, and thus where the left edge of the car should be
-        center_position = window_width / 2
-        left_edge_position = center_position - (self.width() / 2)
-
-        return left_edge_position
+    def calculate_starting_x(self):
+        # Center the car horizontally, using integer division since we are
+        # working in whole pixels anyway
+        return (self.game.width() - self.width()) // 2
 
     def calculate_starting_y(self):
         car_height = self.height()
@@ -680,28 +1059,55 @@ class Car(GameObject):
             self.game.trigger_crash()
 
     def check_collision_with_other_objects(self):
-        for object in self.game.objects:
-            if not object.is_solid:
-                continue
-            collided = not self.collision_box().is_outside(object.collision_box())
-            if not collided:
-                continue
-            if object == self:
-                continue
-            self.game.trigger_crash()
+        # Broad phase: only consider objects bucketed into the grid cells that
+        # our own collision box overlaps
+        cell_size = self.game.SPATIAL_HASH_CELL_SIZE
+        spatial_hash = self.game._spatial_hash
+        our_x1, our_y1, our_x2, our_y2 = self.collision_tuple()
+        for cell_x in range(int(our_x1 // cell_size), int(our_x2 // cell_size) + 1):
+            for cell_y in range(int(our_y1 // cell_size), int(our_y2 // cell_size) + 1):
+                for object, bounds in spatial_hash.get((cell_x, cell_y), ()):
+                    # Skip ourselves before bothering with the overlap test
+                    if object is self:
+                        continue
+                    collided = Box.overlaps_raw(
+                        our_x1,
+                        our_y1,
+                        our_x2,
+                        our_y2,
+                        bounds[0],
+                        bounds[1],
+                        bounds[2],
+                        bounds[3],
+                    )
+                    if not collided:
+                        continue
+                    self.game.trigger_crash()
+                    # One crash is enough - and an object spanning several
+                    # cells would otherwise be visited once per cell
+                    return
 
     def set_velocity_from_keypresses(self):
-        if len(self.pressed_directions) == 0:
+        if not self.pressed_directions:
             self.velocity.x = 0
             return
 
         # Ensures the last-pressed key takes priority
-        pressed_direction = self.pressed_directions[-1]
-        if pressed_direction == "LEFT":
+        if self.last_pressed_direction == self.DIRECTION_LEFT:
             self.velocity.shove_x(-1)
-        if pressed_direction == "RIGHT":
+        elif self.last_pressed_direction == self.DIRECTION_RIGHT:
             self.velocity.shove_x(+1)
 
+    def press_direction(self, direction: int):
+        self.pressed_directions |= direction
+        self.last_pressed_direction = direction
+
+    def release_direction(self, direction: int):
+        self.pressed_directions &= ~direction
+        if self.last_pressed_direction == direction:
+            # Fall back to the other direction if it's still held
+            self.last_pressed_direction = self.pressed_directions
+
     def move_towards_movement_target(self):
         if not self.movement_targets:
             return
@@ -711,7 +1117,8 @@ class Car(GameObject):
             return
 
         # Take the last-added movement target since it corresponds to the last-touched point
-        last_touched_finger = list(self.movement_targets.keys())[-1]
+        # (dicts are insertion-ordered, so this is O(1) with no list copy)
+        last_touched_finger = next(reversed(self.movement_targets))
         target_coordinates = self.movement_targets[last_touched_finger].resolve(game)
         our_coordinates = self.collision_box().center()
 
@@ -748,7 +1155,9 @@ class Car(GameObject):
 
         self.initial_base_speed = 5
         self.velocity = Velocity(self, self.initial_base_speed)
-        self.pressed_directions = []
+        # Bitmask of held movement keys, plus which one was pressed last
+        self.pressed_directions = 0
+        self.last_pressed_direction = 0
         self.movement_targets: dict[int, PointSpecifier] = {}
         self.tick_tasks.append(self.check_collision_with_window_edge)
         self.tick_tasks.append(self.check_collision_with_other_objects)
@@ -760,17 +1169,17 @@ class Car(GameObject):
         @game.on_key_action("move.left")
         def start_moving_left(event):
             def undo(event):
-                self.pressed_directions.remove("LEFT")
+                self.release_direction(self.DIRECTION_LEFT)
 
-            self.pressed_directions.append("LEFT")
+            self.press_direction(self.DIRECTION_LEFT)
             return undo
 
         @game.on_key_action("move.right")
         def start_moving_right(event):
             def undo(event):
-                self.pressed_directions.remove("RIGHT")
+                self.release_direction(self.DIRECTION_RIGHT)
 
-            self.pressed_directions.append("RIGHT")
+            self.press_direction(self.DIRECTION_RIGHT)
             return undo
 
     def draw(self):
@@ -810,7 +1219,8 @@ class Block(GameObject):
         self.spawn_at_x = random.randrange(0, self.game.width())
         self.spawn_at_y = spawn_at
         width, height = self.calculate_size()
-        print("Block width:", width)
+        if __debug__ and DEBUG_EVENTS:
+            print("Block width:", width)
         texture = PlainColorTexture(
             self.game, self.game.theme.FOREGROUND, width, height
         )
@@ -820,6 +1230,22 @@ class Block(GameObject):
         self.velocity = Velocity(self, self.calculate_base_speed())
         self.velocity.shove_y()
 
+    def recycle(self, spawn_at: float = 0):
+        """Reuses this block as a freshly-spawned one, avoiding the cost of
+        constructing (and removing) a whole new Block every respawn"""
+        self.spawn_at_x = random.randrange(0, self.game.width())
+        self.spawn_at_y = spawn_at
+        width, height = self.calculate_size()
+        if __debug__ and DEBUG_EVENTS:
+            print("Block width:", width)
+        self.texture = PlainColorTexture(
+            self.game, self.game.theme.FOREGROUND, width, height
+        )
+        self.refresh_size_snapshot()
+        self.velocity.base_speed = self.calculate_base_speed()
+        self.velocity.shove_y()
+        self.reset()
+
 
 class FPSCounter(GameObject):
     def tick(self):
@@ -843,7 +1269,7 @@ class FPSCounter(GameObject):
 
     def __init__(self, game: Game, spawn_point: PointSpecifier):
         self.game = game
-        self.font = pygame.font.Font("freesansbold.ttf", 12)
+        self.font = game.fps_font
         self.spawn_point = lambda: spawn_point
         texture = TextTexture(game, self.get_content, self.font)
 
@@ -863,16 +1289,16 @@ class ScoreCounter(GameObject):
 
     def __init__(self, game: Game, spawn_point: PointSpecifier):
         self.game = game
-        self.font = pygame.font.Font("freesansbold.ttf", 14)
+        self.font = game.score_font
         self.spawn_point = lambda: spawn_point
         texture = TextTexture(game, self.get_text, self.font)
 
         super().__init__(texture=texture)
 
 
-game = Game(theme=NightTheme)
-game.run()
+if __name__ == "__main__":
+    game = Game(theme=NightTheme)
+    game.run()
 
-# Game has finished
-pygame.quit()
-quit()
+    # Game has finished
+    pygame.quit()